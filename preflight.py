@@ -1,11 +1,23 @@
 #!/usr/bin/env python3
 
 import argparse
+import collections
+import csv
+import functools
+import hashlib
+import json
 import math
-import requests
+import os
 import re
+import tempfile
+import time
 
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+# Standard temperature for accelerate_stop_distance(), °F (ISA standard at
+# sea level), and its reciprocal in °R, derived once at import
+_TEMP_STD = 59.0
+_INV_TEMP_STD_RANKINE = 1.0 / (_TEMP_STD + 459.67)
 
 def accelerate_stop_distance(temperature_f, pressure_altitude_ft, gross_weight_lbs, headwind_mph=0):
     """
@@ -23,22 +35,21 @@ def accelerate_stop_distance(temperature_f, pressure_altitude_ft, gross_weight_l
     """
 
     # Standard reference conditions
-    TEMP_STD = 59.0      # °F (ISA standard at sea level)
+    TEMP_STD = _TEMP_STD  # °F (ISA standard at sea level)
     ALT_STD = 0.0        # ft
     WEIGHT_STD = 4400.0  # lbs (mid-range weight)
     BASE_DISTANCE = 1800.0  # ft
 
     # Input validation and bounds checking
-    temperature_f = max(-60, min(140, temperature_f))
-    pressure_altitude_ft = max(-2000, min(15000, pressure_altitude_ft))
-    gross_weight_lbs = max(3000, min(5600, gross_weight_lbs))
-    headwind_mph = max(0, min(25, headwind_mph))
+    temperature_f = max(-60.0, min(140.0, temperature_f))
+    pressure_altitude_ft = max(-2000.0, min(15000.0, pressure_altitude_ft))
+    gross_weight_lbs = max(3000.0, min(5600.0, gross_weight_lbs))
+    headwind_mph = max(0.0, min(25.0, headwind_mph))
 
     # Temperature factor (air density effect)
     # Based on ideal gas law: ρ ∝ 1/T
     temp_rankine = temperature_f + 459.67
-    temp_std_rankine = TEMP_STD + 459.67
-    temp_factor = temp_rankine / temp_std_rankine
+    temp_factor = temp_rankine * _INV_TEMP_STD_RANKINE
 
     # Altitude factor (pressure altitude effect) - Handle negative altitudes
     # Standard atmosphere model modified for negative altitudes
@@ -80,7 +91,7 @@ def accelerate_stop_distance(temperature_f, pressure_altitude_ft, gross_weight_l
     # Non-linear corrections observed from chart
     # Modified to handle extreme conditions gracefully
     temp_deviation = temperature_f - TEMP_STD
-    temp_correction = 1.0 + (temp_deviation / 80.0) ** 2 * 0.08
+    temp_correction = 1.0 + temp_deviation * temp_deviation * (0.08 / 80.0**2)
 
     # Altitude correction - handle negative altitudes
     if pressure_altitude_ft >= 0:
@@ -91,7 +102,7 @@ def accelerate_stop_distance(temperature_f, pressure_altitude_ft, gross_weight_l
         altitude_correction = max(0.7, altitude_correction)
 
     weight_deviation = gross_weight_lbs - WEIGHT_STD
-    weight_correction = 1.0 + (weight_deviation / 1000.0) ** 2 * 0.05
+    weight_correction = 1.0 + weight_deviation * weight_deviation * (0.05 / 1000.0**2)
 
     # Calculate distance with all factors
     distance = (BASE_DISTANCE *
@@ -104,7 +115,7 @@ def accelerate_stop_distance(temperature_f, pressure_altitude_ft, gross_weight_l
                 weight_correction)
 
     # Apply reasonable bounds with extended range for extreme conditions
-    distance = max(600, min(8000, distance))
+    distance = max(600.0, min(8000.0, distance))
 
     return round(distance)
 
@@ -112,49 +123,209 @@ def weight_balance(front, middle, rear, fuel_main, fuel_tips, fbaggage, rbaggage
     empty_weight = 3193.95
     empty_moment = 290084
 
+    # Avgas at 6 lbs/gal
     weight = ( empty_weight +
                front +
                middle +
                rear +
-               fuel_main * 6  +
-               fuel_tips * 6  +
+               (fuel_main + fuel_tips) * 6 +
                fbaggage +
                rbaggage
             )
 
+    # Arm constants lead each term so the fuel arm * 6 folds at compile time
     moment = ( empty_moment +
                89 * front +
                126 * middle +
                157 * rear +
-               113 * fuel_main * 6 +
-               116 * fuel_tips * 6 +
+               113 * 6 * fuel_main +
+               116 * 6 * fuel_tips +
                10 * fbaggage +
                183 * rbaggage
             )
 
     return weight, moment, moment / weight
 
-# https://ourairports.com/data/airports.csv
-def load_airports_csv(filepath="airports.csv"):
-    return pd.read_csv(filepath)
+CACHE_DIR = os.path.expanduser("~/.cache/preflight")
 
-def get_airport_data(df, icao_code):
-    row = df[df['ident'] == icao_code.upper()]
-    if not row.empty:
-        return row.iloc[0].to_dict()
-    return None
+# Caches are only a speedup: callers already hold the data in memory, so a
+# failed write is skipped. A unique temp file keeps concurrent runs apart.
+def _write_atomic(path, text):
+    cache_dir = os.path.dirname(path) or '.'
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+    except OSError:
+        return
 
-def get_elevation(airport_data):
-    if airport_data and 'elevation_ft' in airport_data:
-        return airport_data['elevation_ft']
-    return None
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+# The CSVs are indexed once and the index is cached as JSON together with
+# the source it was built from; any change to the CSV's path, size or mtime
+# (or to the cache format) makes the cache stale and the index is rebuilt.
+_INDEX_FORMAT = 1
+
+def _source_stamp(csv_path):
+    st = os.stat(csv_path)
+    return [_INDEX_FORMAT, os.path.abspath(csv_path), st.st_size, st.st_mtime_ns]
+
+def _read_index(csv_path, cache_path):
+    try:
+        stamp = _source_stamp(csv_path)
+        with open(cache_path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(cache, dict) or cache.get('source') != stamp:
+        return None
+    index = cache.get('index')
+    return index if isinstance(index, dict) else None
+
+# Each source CSV gets its own cache file, so indexing another dataset
+# can't overwrite the one the CLI relies on
+def _index_cache_path(csv_path):
+    source = os.path.abspath(csv_path)
+    name = os.path.splitext(os.path.basename(source))[0]
+    digest = hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"{name}-{digest}.json")
+
+def _write_index(index, stamp, cache_path):
+    _write_atomic(cache_path, json.dumps({'source': stamp, 'index': index}))
+
+def _float(value):
+    return float(value) if value else math.nan
+
+# https://ourairports.com/data/airports.csv
+def build_airport_index(csv_path="airports.csv", cache_path=None):
+    if cache_path is None:
+        cache_path = _index_cache_path(csv_path)
+    stamp = _source_stamp(csv_path)
+    index = {}
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        ident, elevation = header.index('ident'), header.index('elevation_ft')
+        for row in reader:
+            index[row[ident]] = _float(row[elevation])
+
+    _write_index(index, stamp, cache_path)
+    return index
+
+@functools.lru_cache(maxsize=None)
+def load_airport_index(csv_path="airports.csv", cache_path=None):
+    if cache_path is None:
+        cache_path = _index_cache_path(csv_path)
+    index = _read_index(csv_path, cache_path)
+    if index is None:
+        index = build_airport_index(csv_path, cache_path)
+    return index
+
+def get_elevation_cached(icao_code):
+    return load_airport_index().get(icao_code.upper())
+
+# https://ourairports.com/data/runways.csv
+Runway = collections.namedtuple('Runway', 'length_ft closed le_ident he_heading_degT')
+
+def build_runway_index(csv_path="runways.csv", cache_path=None):
+    if cache_path is None:
+        cache_path = _index_cache_path(csv_path)
+    stamp = _source_stamp(csv_path)
+    index = {}
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        cols = [header.index(c) for c in ('airport_ident',) + Runway._fields]
+        for row in reader:
+            ident, length, closed, le_ident, heading = (row[c] for c in cols)
+            index.setdefault(ident, []).append(
+                (_float(length), int(closed or 0), le_ident, _float(heading)))
+
+    _write_index(index, stamp, cache_path)
+    return index
+
+@functools.lru_cache(maxsize=None)
+def load_runway_index(csv_path="runways.csv", cache_path=None):
+    if cache_path is None:
+        cache_path = _index_cache_path(csv_path)
+    index = _read_index(csv_path, cache_path)
+    if index is None:
+        index = build_runway_index(csv_path, cache_path)
+    return index
+
+def get_runways(icao_code):
+    return [Runway(*rw) for rw in load_runway_index().get(icao_code.upper(), ())]
+
+# Reused across fetches so the TLS connection is kept alive
+@functools.lru_cache(maxsize=None)
+def _session():
+    import requests
+    return requests.Session()
+
+METAR_CACHE_DIR = os.path.join(CACHE_DIR, "metar")
+METAR_CACHE_TTL = 30 * 60  # s
 
 def fetch_metar(airport_code):
+    cache_path = os.path.join(METAR_CACHE_DIR, f"{airport_code}.txt")
+    try:
+        if time.time() - os.path.getmtime(cache_path) < METAR_CACHE_TTL:
+            with open(cache_path, encoding='utf-8') as f:
+                return f.read().strip()
+    except OSError:
+        pass
+
+    # Repeated requests within the same minute are served from memory
+    metar = _fetch_metar(airport_code, int(time.time() // 60))
+    if metar:
+        _write_atomic(cache_path, metar)
+
+    return metar
+
+# Successful fetches only, keyed on (airport_code, minute), so a failed
+# request can be retried straight away
+_metar_memo = {}
+
+def _fetch_metar(airport_code, minute):
+    import requests
+
+    key = (airport_code, minute)
+    if key in _metar_memo:
+        return _metar_memo[key]
+
     url = f"https://aviationweather.gov/api/data/metar?ids={airport_code}&hours=0&order=id%2C-obs&sep=true"
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.text.strip()
-    return None
+    try:
+        response = _session().get(url, timeout=(3, 5))
+    except requests.RequestException:
+        return None
+    if response.status_code != 200:
+        return None
+
+    metar = response.text.strip()
+    if metar:
+        # Entries from earlier minutes can never be hit again
+        for stale in [k for k in _metar_memo if k[1] != minute]:
+            del _metar_memo[stale]
+        _metar_memo[key] = metar
+    return metar
+
+# All METAR fields of interest, matched in a single left-to-right scan.
+# The rmk alternative consumes the rest of the report, so fields that only
+# appear inside the remarks (e.g. an A3002 after RMK) are deliberately
+# ignored and leave the defaults in place.
+_RE_METAR = re.compile(r'\b(?:(?P<time>\d{6}Z\b)'
+                       r'|(?P<wind>(?:\d{3}|VRB)\d{2}(?:G\d{2})?KT\b)'
+                       r'|(?P<var>\d{3}V\d{3}\b)'
+                       r'|(?P<temp>M?\d{2}/M?\d{2}\b)'
+                       r'|(?P<press>A\d{4}\b)'
+                       r'|(?P<rmk>RMK\s+.*))')
 
 def parse_metar(metar):
     result = {
@@ -179,48 +350,50 @@ def parse_metar(metar):
     if tokens:
         result['airport'] = tokens[0]
 
-    # Observation time: e.g., 311956Z = 31st day, 19:56 Zulu
-    time_match = re.search(r'\b(\d{2})(\d{2})(\d{2})Z\b', metar)
-    if time_match:
-        day, hour, minute = time_match.groups()
-        result['time_utc'] = f"{day}T{hour}:{minute}Z"
-
-    # Wind: e.g., 14012G18KT or VRB05KT
-    wind_match = re.search(r'\b(\d{3}|VRB)(\d{2})(G\d{2})?KT\b', metar)
-    if wind_match:
-        direction, speed, gust = wind_match.groups()
-        if direction == 'VRB':
-            result['wind_direction'] = 0
-            result['wind_speed_kt'] = 0
-        else:
-            result['wind_direction'] = int(direction)
-            result['wind_speed_kt'] = int(speed)
-        if gust:
-            result['wind_gust_kt'] = int(gust[1:])
-        else:
-            result['wind_gust_kt'] = int(speed)
-
-    # Variable wind direction: e.g., 180V240
-    var_wind_match = re.search(r'\b(\d{3})V(\d{3})\b', metar)
-    if var_wind_match:
-        result['variable_wind_dir'] = f"{var_wind_match.group(1)}V{var_wind_match.group(2)}"
-
-    # Temperature/dewpoint: e.g., 32/26 or M05/M07
-    temp_match = re.search(r'\b(M?\d{2})/(M?\d{2})\b', metar)
-    if temp_match:
-        t, d = temp_match.groups()
-        result['temperature_c'] = int(t.replace('M', '-'))
-        result['dewpoint_c'] = int(d.replace('M', '-'))
-
-    # Pressure: e.g., A3004 → 30.04 inHg
-    pressure_match = re.search(r'\bA(\d{4})\b', metar)
-    if pressure_match:
-        result['pressure_inhg'] = float(pressure_match.group(1)[:2] + '.' + pressure_match.group(1)[2:])
-
-    # Remarks section: everything after RMK
-    remarks_match = re.search(r'\bRMK\s+(.*)', metar)
-    if remarks_match:
-        result['remarks'] = remarks_match.group(1).strip()
+    # Only the first occurrence of each field is used
+    seen = set()
+    for match in _RE_METAR.finditer(metar):
+        kind = match.lastgroup
+        if kind in seen:
+            continue
+        seen.add(kind)
+        s = match.group()
+
+        if kind == 'time':
+            # Observation time: e.g., 311956Z = 31st day, 19:56 Zulu
+            result['time_utc'] = f"{s[:2]}T{s[2:4]}:{s[4:6]}Z"
+
+        elif kind == 'wind':
+            # Wind: e.g., 14012G18KT or VRB05KT
+            direction, speed = s[:3], s[3:5]
+            if direction == 'VRB':
+                result['wind_direction'] = 0
+                result['wind_speed_kt'] = 0
+            else:
+                result['wind_direction'] = int(direction)
+                result['wind_speed_kt'] = int(speed)
+            if s[5] == 'G':
+                result['wind_gust_kt'] = int(s[6:8])
+            else:
+                result['wind_gust_kt'] = int(speed)
+
+        elif kind == 'var':
+            # Variable wind direction: e.g., 180V240
+            result['variable_wind_dir'] = s
+
+        elif kind == 'temp':
+            # Temperature/dewpoint: e.g., 32/26 or M05/M07
+            t, d = s.split('/')
+            result['temperature_c'] = int(t.replace('M', '-'))
+            result['dewpoint_c'] = int(d.replace('M', '-'))
+
+        elif kind == 'press':
+            # Pressure: e.g., A3004 → 30.04 inHg
+            result['pressure_inhg'] = float(s[1:3] + '.' + s[3:5])
+
+        elif kind == 'rmk':
+            # Remarks section: everything after RMK
+            result['remarks'] = s[3:].strip()
 
     return result
 
@@ -237,54 +410,47 @@ def density_altitude(elev, altimeter, oat):
 ###  Take-off Distance  ####
 ############################
 
+# The performance fits below are bivariate cubics, evaluated in Horner
+# form over the first (distance/altitude) variable to avoid ** dispatch.
+
 def takeoff_50_nowind(w, da) :
-    dist = (1.317919e-03
-            - 9.248807e-01 * da
-            + 2.010712e+00 * w
-            - 1.382750e-04 * da**2
-            + 6.107982e-04 * da*w
-            - 7.011730e-04 * w**2
-            + 4.315973e-09 * da**3
-            + 2.147113e-08 * da**2*w
-            - 8.016888e-08 * da*w**2
-            + 7.058259e-08 * w**3)
+    dist = (((4.315973e-09 * da
+              + 2.147113e-08 * w
+              - 1.382750e-04) * da
+             + (-8.016888e-08 * w + 6.107982e-04) * w
+             - 9.248807e-01) * da
+            + ((7.058259e-08 * w - 7.011730e-04) * w + 2.010712e+00) * w
+            + 1.317919e-03)
     return int(dist)
 
 def landing_50_nowind(w, da) : 
-    dist = (7.619239e-04
-           - 1.129351e-01 * da
-           + 1.161095e+00 * w
-           - 5.460050e-05 * da**2
-           + 1.580332e-04 * da*w
-           - 3.224121e-04 * w**2
-           + 1.491857e-09 * da**3
-           + 8.151763e-09 * da**2*w
-           - 2.389780e-08 * da*w**2
-           + 2.976384e-08 * w**3)
+    dist = (((1.491857e-09 * da
+              + 8.151763e-09 * w
+              - 5.460050e-05) * da
+             + (-2.389780e-08 * w + 1.580332e-04) * w
+             - 1.129351e-01) * da
+            + ((2.976384e-08 * w - 3.224121e-04) * w + 1.161095e+00) * w
+            + 7.619239e-04)
     return int(dist)
 
 def headwind_takeoff(w, t) :
-    d =   (- 1.345024e+02 + 1.212677e+00 * t - 1.580498e+00 * w
-          - 1.001003e-04 * t**2
-          + 1.770352e-02 * w**2
-          - 2.179669e-02 * t*w
-          + 1.417450e-08 * t**3
-          + 7.076594e-07 * t**2*w
-          + 3.379797e-04 * t*w**2
-          - 1.500000e-02 * w**3)
+    d = (((1.417450e-08 * t
+           + 7.076594e-07 * w
+           - 1.001003e-04) * t
+          + (3.379797e-04 * w - 2.179669e-02) * w
+          + 1.212677e+00) * t
+         + ((-1.500000e-02 * w + 1.770352e-02) * w - 1.580498e+00) * w
+         - 1.345024e+02)
     return int(d)
 
 def headwind_land(w, l):
-    dist = (-7.384758e+02
-            + 2.398023e+00 * l
-            - 4.749474e-01 * w
-            - 8.651134e-04 * l**2
-            - 1.528699e-02 * l*w
-            - 3.277356e-02 * w**2
-            + 1.751042e-07 * l**3
-            + 2.111363e-06 * l**2*w
-            + 3.409930e-06 * l*w**2
-            + 2.424242e-03 * w**3)
+    dist = (((1.751042e-07 * l
+              + 2.111363e-06 * w
+              - 8.651134e-04) * l
+             + (3.409930e-06 * w - 1.528699e-02) * w
+             + 2.398023e+00) * l
+            + ((2.424242e-03 * w - 3.277356e-02) * w - 4.749474e-01) * w
+            - 7.384758e+02)
     return int(dist)
 
 def rev_name(name):
@@ -312,8 +478,11 @@ def __print_performance(d, weight, to_nw, land_nw, rw, rev):
         le = (float(rw.he_heading_degT) + 180) % 360
         name = rev_name(name)
 
-    headwind  = int(d['wind_speed_kt'] * math.cos(math.radians(d['wind_direction'] - le)))
-    crosswind = int(d['wind_speed_kt'] * math.sin(math.radians(d['wind_direction'] - le)))
+    dtheta = math.radians(d['wind_direction'] - le)
+    c, s = math.cos(dtheta), math.sin(dtheta)
+
+    headwind  = int(d['wind_speed_kt'] * c)
+    crosswind = int(d['wind_speed_kt'] * s)
     if crosswind > 0:
         crosswind = str(crosswind) + 'R'
     elif crosswind < 0:
@@ -322,15 +491,18 @@ def __print_performance(d, weight, to_nw, land_nw, rw, rev):
     to = headwind_takeoff(headwind * 1.15, to_nw) 
     land = headwind_land(headwind * 1.15, land_nw)
 
-    headwind_gust  = int(d['wind_gust_kt'] * math.cos(math.radians(d['wind_direction'] - le)))
-    crosswind_gust = int(d['wind_gust_kt'] * math.sin(math.radians(d['wind_direction'] - le)))
+    headwind_gust  = int(d['wind_gust_kt'] * c)
+    crosswind_gust = int(d['wind_gust_kt'] * s)
     to_gust = headwind_takeoff(headwind_gust * 1.15, to_nw) 
     land_gust = headwind_land(headwind_gust * 1.15, land_nw) 
 
     tf = (d['temperature_c'] * 9/5 ) + 32
     start_stop_calm = accelerate_stop_distance(tf, d['pressure_inhg'], weight)
-    start_stop      = accelerate_stop_distance(tf, d['pressure_inhg'], weight, headwind_gust * 1.15)
-    start_stop_gust = accelerate_stop_distance(tf, d['pressure_inhg'], weight, headwind_gust * 1.15)
+    start_stop      = accelerate_stop_distance(tf, d['pressure_inhg'], weight, headwind * 1.15)
+    if headwind_gust == headwind:
+        start_stop_gust = start_stop
+    else:
+        start_stop_gust = accelerate_stop_distance(tf, d['pressure_inhg'], weight, headwind_gust * 1.15)
 
     print(f"RW  HW  CW Length:")
     print(f"{name:3} {headwind:3} {crosswind:3} {length:>5}")
@@ -348,8 +520,7 @@ def print_performance(d, weight, to_nw, land_nw, rw):
     __print_performance(d, weight, to_nw, land_nw, rw, False)
     __print_performance(d, weight, to_nw, land_nw, rw, True)
 
-def print_weather(ident, elevation) :
-    metar = fetch_metar(ident)
+def print_weather(ident, elevation, metar) :
     d = parse_metar(metar)
     if not metar:
         print("Failed to fetch METAR.")
@@ -397,13 +568,19 @@ if __name__ == "__main__":
 
     weight, moment, cg = weight_balance(args.f, args.m, args.r, args.g, args.G, args.B, args.b)
 
-    airports = pd.read_csv("airports.csv")
-    airport = airports[airports.ident == ident]
-    if airport.size == 0:
-        airport = airports[airports.ident == ident[1:]]
+    # The METAR fetch is network bound and independent of the CSV loads
+    with ThreadPoolExecutor() as executor:
+        metar = executor.submit(fetch_metar, ident)
+        runways = executor.submit(load_runway_index)
+        elevation = get_elevation_cached(ident)
+        if elevation is None:
+            elevation = get_elevation_cached(ident[1:])
+        metar = metar.result()
+        runways.result()
 
-    elevation = float(airport.elevation_ft.values[0])
-    d, pa, da = print_weather(ident, elevation)
+    if elevation is None:
+        parser.error(f"unknown airport {ident}")
+    d, pa, da = print_weather(ident, elevation, metar)
 
     to_nw = takeoff_50_nowind(weight, da)
     land_nw = landing_50_nowind(weight, da)
@@ -414,12 +591,9 @@ if __name__ == "__main__":
     print(f"{'Moment':20} {'in*lbs':10} {int(moment):8,.0f}")
     print(f"{'Center Gravity':20} {'in':10} {cg:8,.1f}")
 
-    runways = pd.read_csv("runways.csv")
-    rws = runways[runways.airport_ident == ident]
-    if rws.size == 0:
-        rws = runways[runways.airport_ident == ident[1:]]
+    rws = get_runways(ident) or get_runways(ident[1:])
 
     print(f'\n{'Performance'}: {'Calm':>9} {'Wind':>6} {'Gusts':>6}')
     print('─' * 36)
-    for index, rw in rws.iterrows():
+    for rw in rws:
         print_performance(d, weight, to_nw, land_nw, rw)